@@ -13,7 +13,7 @@ from secrets import token_hex
 ROOT_DOMAIN = os.getenv("ROOT_DOMAIN", "b01le.rs")  # TODO: make it compliant with the testing workflow and VPS
 HTTP_ENTRY = 443
 TCP_SEC_ENTRY = 1337
-DOCKER_REGISTRY = "localhost:5000"
+DOCKER_REGISTRY = os.getenv("DOCKER_REGISTRY", "localhost:5000")
 
 # Default challenge directories
 SRC = "src"
@@ -36,6 +36,7 @@ DOCKERFILE_BUILD = "Dockerfile_build"
 PWN_BUILD = "pwn_build.sh"
 DEV_SH = "dev.sh"
 RUN_SH = "run.sh"
+CACHE_SH = "cache.sh"
 README = "README.md"
 FLAG = "flag.txt"
 
@@ -368,6 +369,17 @@ You should keep this structure the same when you add your challenge as it is imp
 
  - `./dev.sh` will run your challenge using the binary in dist.
 
+"""
+
+        if self.deploy != DeployType.NO_DEPLOY:
+            ret += f"""\n### Build cache
+The generated scripts can import and export BuildKit layer caches from the registry at `{self.registry}`, so a fresh host can build your challenge mostly from cache.
+This is off by default. Enable it by setting `BUILD_CACHE=1`, and point it at another registry with `CACHE_REGISTRY`:
+```bash
+BUILD_CACHE=1 ./dev.sh
+```
+Builds import from both this challenge's cache and a base cache shared by challenges of the same template, but only export to this challenge's cache unless `BUILD_CACHE_BASE=1` is set. The base cache holds whichever challenge exported to it last.
+To try it locally, start a registry container first with `docker run -d -p 5000:5000 --name registry registry:2`.
 """
 
         if self.deploy == DeployType.KLODD:
@@ -480,11 +492,22 @@ This README was autogenerated by `mkchal.py`, but written by Neil (CygnusX). Sug
             "name": safe_name,
             "port": self.ports[0],
             "hash": ChallengeUtils.generate_service_name(safe_name),
+            "build_cache": self.gen_build_cache(),
         }
 
         assert self.type == ChallengeType.PWN
         return ChallengeUtils.generate_file_content(PWN_TEMPLATE_DIR / PWN_BUILD, kwargs)
 
+    def gen_build_cache(self) -> str:
+        """Generates the registry build cache helpers shared by the build scripts"""
+        kwargs = {
+            "name": ChallengeUtils.safe_name(self.name),
+            # challenges built from the same Dockerfile template share a base cache
+            "base": self.type.value if self.type in SPECIAL_CHAL_TYPES else "default",
+            "registry": self.registry,
+        }
+        return ChallengeUtils.generate_file_content(TEMPLATES_DIR / CACHE_SH, kwargs)
+
     def gen_run_sh(self):
         safe_name = ChallengeUtils.safe_name(self.name)
         subdomain = ChallengeUtils.generate_service_name(safe_name)
@@ -496,6 +519,7 @@ This README was autogenerated by `mkchal.py`, but written by Neil (CygnusX). Sug
                 else f"ncat --ssl {subdomain}.{ROOT_DOMAIN} {TCP_SEC_ENTRY}"
             ),
             "registry": self.registry,
+            "build_cache": self.gen_build_cache(),
         }
         if self.type == ChallengeType.WEB and self.deploy == DeployType.KLODD:
             return ChallengeUtils.generate_file_content(TEMPLATES_DIR / self.type.value / "klodd" / RUN_SH, kwargs)
@@ -508,6 +532,7 @@ This README was autogenerated by `mkchal.py`, but written by Neil (CygnusX). Sug
             "local_command": (
                 "curl http://localhost:1337" if self.type == ChallengeType.WEB else "ncat localhost 1337"
             ),
+            "build_cache": self.gen_build_cache(),
         }
         return ChallengeUtils.generate_file_content(TEMPLATES_DIR / DEV_SH, kwargs)
 
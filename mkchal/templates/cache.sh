@@ -0,0 +1,46 @@
+# Registry-backed BuildKit layer cache, off by default.
+# Set BUILD_CACHE=1 to import and export layer caches keyed per challenge and per base,
+# so a fresh host can bring the challenge up mostly from cache.
+# Set BUILD_CACHE_BASE=1 to also export to the shared base cache (last writer wins).
+# Set CACHE_REGISTRY to store the caches somewhere other than {registry}.
+CACHE_REGISTRY="${{CACHE_REGISTRY:-{registry}}}"
+CACHE_BUILDER="${{CACHE_BUILDER:-ctf-cache}}"
+
+use_build_cache() {{
+    [ "$BUILD_CACHE" = 1 ] || return 1
+    case "$runner" in
+        *docker*) ;;
+        *)
+            echo "BUILD_CACHE needs docker buildx, building without cache"
+            return 1
+            ;;
+    esac
+    # the default docker driver cannot export caches, so use a docker-container builder
+    # on the host network so it can reach a registry on localhost
+    $runner buildx inspect "$CACHE_BUILDER" >/dev/null 2>&1 && return 0
+    $runner buildx create --name "$CACHE_BUILDER" --driver docker-container --driver-opt network=host >/dev/null 2>&1
+    # another script may have created the builder first, which is fine
+    if ! $runner buildx inspect "$CACHE_BUILDER" >/dev/null 2>&1; then
+        echo "Could not create buildx builder $CACHE_BUILDER, building without cache"
+        return 1
+    fi
+}}
+
+# usage: cached_build <context> <dockerfile> <image tag> <cache key>
+cached_build() {{
+    chall_cache="$CACHE_REGISTRY/cache/{name}:$4"
+    base_cache="$CACHE_REGISTRY/cache/base-{base}:$4"
+    # exporting to the shared base cache is opt-in since every export overwrites it
+    base_export=""
+    if [ "$BUILD_CACHE_BASE" = 1 ]; then
+        base_export="--cache-to=type=registry,ref=$base_cache,mode=max,ignore-error=true"
+    fi
+    # a registry outage should only cost the cache, not the build
+    $runner buildx build --builder "$CACHE_BUILDER" --load \
+        -f "$2" -t "$3" \
+        --cache-from "type=registry,ref=$chall_cache" \
+        --cache-from "type=registry,ref=$base_cache" \
+        --cache-to "type=registry,ref=$chall_cache,mode=max,ignore-error=true" \
+        $base_export \
+        "$1"
+}}
@@ -10,8 +10,14 @@ else
     exit 1
 fi
 
+{build_cache}
 cd -- "$(dirname -- "$0")/deploy"
-$runner compose up -d --build chall
+if use_build_cache; then
+    cached_build .. Dockerfile '{name}-chall' chall
+    $runner compose up -d --no-build chall
+else
+    $runner compose up -d --build chall
+fi
 echo '
 
 
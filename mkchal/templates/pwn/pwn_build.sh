@@ -10,15 +10,26 @@ LIB_PATH="/srv/lib/x86_64-linux-gnu"
 export LIBC_PATH="$LIB_PATH/libc.so.6"
 export LINKER_PATH="$LIB_PATH/ld-linux-x86-64.so.2"
 
-# pass user id and group id we want chall build file to have to docker-compose
+# pass user id and group id we want chall build file to have to docker compose
 export USER_ID=$(id -u)
 export GROUP_ID=$(id -g)
 export CHALL_HASH='{hash}' # please include this envar in your final build
 
-# Don't use sudo to run docker-compose here, you have to add yourself to docker group
+runner="sudo -E docker"
+
+{build_cache}
+# Don't use sudo to run docker compose here, you have to add yourself to docker group
 # If you need to use sudo, you have to pass options to sudo to make sure
-# USER_ID and GROUP_ID env variables are passed into docker-compose
+# USER_ID and GROUP_ID env variables are passed into docker compose
 # Otherwise outputed files in dist will be owned by root
-cd deploy \
-    && sudo -E docker-compose up --build build \
-    && sudo -E docker-compose up --build libc
+cd deploy
+if use_build_cache; then
+    # the chall image copies build_out/chall, so it is built after the build service ran
+    cached_build .. Dockerfile_build '{name}-build' build \
+        && $runner compose up build \
+        && cached_build .. Dockerfile '{name}-chall' chall \
+        && $runner compose up libc
+else
+    $runner compose up --build build \
+        && $runner compose up --build libc
+fi
@@ -11,10 +11,18 @@ else
     exit 1
 fi
 
+{build_cache}
+if use_build_cache; then
+	cached_build .. Dockerfile '{name}-chall' chall
+	build_flag="--no-build"
+else
+	build_flag="--build"
+fi
+
 if [ -f docker-compose.prod.yml ]; then
-	$runner compose -f docker-compose.yml -f docker-compose.prod.yml up -d --build chall
+	$runner compose -f docker-compose.yml -f docker-compose.prod.yml up -d $build_flag chall
 else
-	$runner compose up -d --build chall
+	$runner compose up -d $build_flag chall
 fi
 echo '
 
@@ -1,6 +1,13 @@
 #!/bin/sh
 set -e
+runner="sudo -E docker"
+
+{build_cache}
 cd deploy
-sudo docker build . -t '{name}'
-sudo -E docker push '{registry}/{name}'
+if use_build_cache; then
+    cached_build .. Dockerfile '{registry}/{name}' chall
+else
+    $runner build -f Dockerfile -t '{registry}/{name}' ..
+fi
+$runner push '{registry}/{name}'
 kubectl create -f challenge.yml